@@ -0,0 +1 @@
+# Lets the tests import weight_tracking_to_sql from the repository root
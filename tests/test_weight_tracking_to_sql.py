@@ -0,0 +1,77 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyodbc")
+pytest.importorskip("matplotlib")
+
+from weight_tracking_to_sql import WeightTracker, downsample_min_max
+
+HEADER = "Date,Weight,Notes,WeightTrend,SleepDrtn,RestingHr\n"
+
+
+@pytest.fixture
+def tracker():
+    # _read_csv_rows doesn't touch the database, so skip __init__ and its connection
+    return WeightTracker.__new__(WeightTracker)
+
+
+def write_csv(tmp_path, text, encoding="utf-8"):
+    path = tmp_path / "weights.csv"
+    path.write_text(text, encoding=encoding)
+    return str(path)
+
+
+def test_read_csv_rows_skips_blank_lines(tracker, tmp_path):
+    filename = write_csv(tmp_path, HEADER + "2024-01-01,150.5,,No trend,7.5,60\n\n,,,,,\n")
+
+    rows, errors = tracker._read_csv_rows(filename)
+
+    assert rows == [(date(2024, 1, 1), 150.5, None, "No trend", 7.5, 60)]
+    assert errors == []
+
+
+def test_read_csv_rows_reports_missing_date(tracker, tmp_path):
+    filename = write_csv(tmp_path, HEADER + ",150,,,,\n")
+
+    rows, errors = tracker._read_csv_rows(filename)
+
+    assert rows == []
+    assert len(errors) == 1
+    assert errors[0].startswith("line 2:")
+
+
+def test_read_csv_rows_parses_non_iso_dates(tracker, tmp_path):
+    filename = write_csv(tmp_path, HEADER + "01/02/2024,150,,,,72.0\nnot a date,151,,,,\n")
+
+    rows, errors = tracker._read_csv_rows(filename)
+
+    assert rows == [(date(2024, 1, 2), 150.0, None, None, None, 72)]
+    assert len(errors) == 1
+    assert errors[0].startswith("line 3:")
+
+
+def test_read_csv_rows_handles_utf8_bom(tracker, tmp_path):
+    filename = write_csv(tmp_path, HEADER + "2024-01-01,150,Café,,,\n", encoding="utf-8-sig")
+
+    rows, errors = tracker._read_csv_rows(filename)
+
+    assert rows == [(date(2024, 1, 1), 150.0, "Café", None, None, None)]
+    assert errors == []
+
+
+def test_downsample_min_max_keeps_gaps():
+    x = np.arange(10_000)
+    y = np.sin(x / 100.0)
+    y[4000:4500] = np.nan
+
+    x_out, y_out = downsample_min_max(x, y, n_out=300)
+
+    assert len(y_out) <= 300
+    assert np.all(np.diff(x_out) > 0)
+    gap = np.flatnonzero(np.isnan(y_out))
+    assert len(gap) > 0
+    assert np.all((x_out[gap] >= 4000) & (x_out[gap] < 4500))
+    assert np.nanmin(y_out) == np.nanmin(y)
+    assert np.nanmax(y_out) == np.nanmax(y)
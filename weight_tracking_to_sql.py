@@ -1,12 +1,313 @@
 import pyodbc
 import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
-import statistics
+from datetime import datetime
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
-from collections import defaultdict
 import os
+import re
+import csv
+import sys
+import io
+import shutil
+import pydoc
+
+# turbodbc is optional; when installed, large reads are fetched as Arrow columns instead of Python rows
+try:
+    import turbodbc
+except ImportError:
+    turbodbc = None
+
+# Fast-path patterns for well-formed user input; anything else goes through the full parsers
+_DATE_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+_FLOAT_RE = re.compile(r'[0-9]+(\.[0-9]+)?')
+_INT_RE = re.compile(r'[0-9]+')
+
+def _parse_iso_date(date_str):
+    """
+    Parse a YYYY-MM-DD string without going through strptime or pandas.
+
+    Args:
+        date_str (str): The date string to parse.
+
+    Returns:
+        datetime.date or None: The parsed date, or None if the string is not in YYYY-MM-DD form.
+
+    Raises:
+        ValueError: If the string is in YYYY-MM-DD form but is not a valid date.
+    """
+    if not _DATE_RE.fullmatch(date_str):
+        return None
+    return datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10])).date()
+
+# Columns of the Weights table, in table order
+ENTRY_COLUMNS = "Date, Weight, Notes, WeightTrend, SleepDrtn, RestingHr"
+
+# Insert a full row, e.g. from a CSV backup or import file
+INSERT_SQL = '''
+    INSERT INTO Weights (Date, Weight, Notes, WeightTrend, SleepDrtn, RestingHr)
+    VALUES (?, ?, ?, ?, ?, ?);
+'''
+
+# Parameter types for INSERT_SQL, matching the Weights column definitions
+INSERT_INPUT_SIZES = [
+    (pyodbc.SQL_TYPE_DATE, 0, 0),
+    (pyodbc.SQL_DOUBLE, 0, 0),
+    (pyodbc.SQL_VARCHAR, 50, 0),
+    (pyodbc.SQL_VARCHAR, 25, 0),
+    (pyodbc.SQL_DOUBLE, 0, 0),
+    (pyodbc.SQL_INTEGER, 0, 0),
+]
+
+# Number of rows fetched per chunk when reading query results into a DataFrame
+READ_CHUNKSIZE = 10_000
+
+# Number of rows fetched per batch when printing the weight log
+LOG_FETCH_SIZE = 1000
+
+# Number of rows written per chunk when exporting a table to CSV
+EXPORT_CHUNKSIZE = 50_000
+
+# Trend of weight w.Weight against the previous dated weight p.Weight (NULL when there is none)
+TREND_CASE_SQL = '''
+    CASE
+        WHEN w.Weight IS NULL THEN 'No weight provided'
+        WHEN p.Weight IS NULL THEN 'No trend'
+        WHEN w.Weight > p.Weight THEN 'increasing'
+        WHEN w.Weight < p.Weight THEN 'decreasing'
+        ELSE 'stable'
+    END
+'''
+
+# Most recent weight recorded before the row aliased as w
+PREVIOUS_WEIGHT_SQL = '''
+    OUTER APPLY (
+        SELECT TOP 1 prev.Weight FROM Weights AS prev
+        WHERE prev.Date < w.Date AND prev.Weight IS NOT NULL
+        ORDER BY prev.Date DESC
+    ) AS p
+'''
+
+# Recompute the trend of the first weighted entry after a date, whose previous weight may have changed
+NEXT_TREND_SQL = f'''
+    UPDATE w
+    SET WeightTrend = {TREND_CASE_SQL}
+    FROM Weights AS w
+    {PREVIOUS_WEIGHT_SQL}
+    WHERE w.Date = (SELECT MIN(Date) FROM Weights WHERE Date > ? AND Weight IS NOT NULL);
+'''
+
+# Insert a single entry, computing its trend on the server. Notes are not cut to the
+# column size, so notes longer than 50 characters raise a truncation error.
+ADD_ENTRY_SQL = f'''
+    INSERT INTO Weights (Date, Weight, Notes, WeightTrend, SleepDrtn, RestingHr)
+    SELECT w.Date, w.Weight, w.Notes, {TREND_CASE_SQL}, w.SleepDrtn, w.RestingHr
+    FROM (
+        SELECT CAST(? AS DATE) AS Date, CAST(? AS FLOAT) AS Weight, CAST(? AS VARCHAR(MAX)) AS Notes,
+               CAST(? AS FLOAT) AS SleepDrtn, CAST(? AS INT) AS RestingHr
+    ) AS w
+    {PREVIOUS_WEIGHT_SQL};
+'''
+
+# Update a single entry, recomputing its trend and the trend of the next weighted entry on the server
+UPDATE_ENTRY_SQL = f'''
+    SET NOCOUNT ON;
+    UPDATE e
+    SET Weight = w.Weight, Notes = w.Notes, WeightTrend = {TREND_CASE_SQL},
+        SleepDrtn = w.SleepDrtn, RestingHr = w.RestingHr
+    FROM Weights AS e
+    CROSS APPLY (
+        SELECT e.Date AS Date, CAST(? AS FLOAT) AS Weight, CAST(? AS VARCHAR(MAX)) AS Notes,
+               CAST(? AS FLOAT) AS SleepDrtn, CAST(? AS INT) AS RestingHr
+    ) AS w
+    {PREVIOUS_WEIGHT_SQL}
+    WHERE e.Date = ?;
+    {NEXT_TREND_SQL}
+'''
+
+# Recompute the trend of every entry on or after a date in one pass
+RECALCULATE_TRENDS_SQL = f'''
+    UPDATE w
+    SET WeightTrend = {TREND_CASE_SQL}
+    FROM Weights AS w
+    {PREVIOUS_WEIGHT_SQL}
+    WHERE w.Date >= ?;
+'''
+
+# Server-side load of a CSV backup; the path is a string literal, so single quotes must be doubled.
+# MAXERRORS = 0 makes any bad row fail the load instead of silently skipping up to 10 of them.
+BULK_INSERT_SQL = '''
+    BULK INSERT Weights
+    FROM '{path}'
+    WITH (FORMAT = 'CSV', FIRSTROW = 2, FIELDTERMINATOR = ',', ROWTERMINATOR = '0x0a', MAXERRORS = 0, TABLOCK);
+'''
+
+# Rebuild the single WeightStatsCache row from all entries with a weight
+REFRESH_STATS_CACHE_SQL = '''
+    MERGE WeightStatsCache AS c
+    USING (
+        SELECT 1 AS Id, AVG(Weight) AS AvgWeight, MIN(Weight) AS MinWeight, MAX(Weight) AS MaxWeight,
+               COUNT(*) AS Total, MIN(Date) AS FirstDate, MAX(Date) AS LastDate,
+               (SELECT TOP 1 Weight FROM Weights WHERE Weight IS NOT NULL ORDER BY Date) AS FirstWeight,
+               (SELECT TOP 1 Weight FROM Weights WHERE Weight IS NOT NULL ORDER BY Date DESC) AS LastWeight,
+               AVG(CAST(RestingHr AS FLOAT)) AS AvgRestingHr, MIN(RestingHr) AS MinRestingHr,
+               MAX(RestingHr) AS MaxRestingHr, COUNT(RestingHr) AS TotalRestingHr
+        FROM Weights
+        WHERE Weight IS NOT NULL
+    ) AS s
+    ON c.Id = s.Id
+    WHEN MATCHED THEN
+        UPDATE SET AvgWeight = s.AvgWeight, MinWeight = s.MinWeight, MaxWeight = s.MaxWeight, Total = s.Total,
+                   FirstDate = s.FirstDate, LastDate = s.LastDate, FirstWeight = s.FirstWeight,
+                   LastWeight = s.LastWeight, AvgRestingHr = s.AvgRestingHr, MinRestingHr = s.MinRestingHr,
+                   MaxRestingHr = s.MaxRestingHr, TotalRestingHr = s.TotalRestingHr
+    WHEN NOT MATCHED THEN
+        INSERT (Id, AvgWeight, MinWeight, MaxWeight, Total, FirstDate, LastDate, FirstWeight, LastWeight,
+                AvgRestingHr, MinRestingHr, MaxRestingHr, TotalRestingHr)
+        VALUES (s.Id, s.AvgWeight, s.MinWeight, s.MaxWeight, s.Total, s.FirstDate, s.LastDate, s.FirstWeight,
+                s.LastWeight, s.AvgRestingHr, s.MinRestingHr, s.MaxRestingHr, s.TotalRestingHr);
+'''
+
+# Fold one newly added entry into a non-empty WeightStatsCache row (running means); entries without a weight are ignored
+ADD_TO_STATS_CACHE_SQL = '''
+    UPDATE c
+    SET AvgWeight = c.AvgWeight + (n.Weight - c.AvgWeight) / (c.Total + 1),
+        MinWeight = CASE WHEN n.Weight < c.MinWeight THEN n.Weight ELSE c.MinWeight END,
+        MaxWeight = CASE WHEN n.Weight > c.MaxWeight THEN n.Weight ELSE c.MaxWeight END,
+        Total = c.Total + 1,
+        FirstDate = CASE WHEN n.Date < c.FirstDate THEN n.Date ELSE c.FirstDate END,
+        FirstWeight = CASE WHEN n.Date < c.FirstDate THEN n.Weight ELSE c.FirstWeight END,
+        LastDate = CASE WHEN n.Date > c.LastDate THEN n.Date ELSE c.LastDate END,
+        LastWeight = CASE WHEN n.Date > c.LastDate THEN n.Weight ELSE c.LastWeight END,
+        AvgRestingHr = CASE WHEN n.RestingHr IS NULL THEN c.AvgRestingHr
+                            ELSE ISNULL(c.AvgRestingHr, 0)
+                                 + (n.RestingHr - ISNULL(c.AvgRestingHr, 0)) / (c.TotalRestingHr + 1) END,
+        MinRestingHr = CASE WHEN c.MinRestingHr IS NULL OR n.RestingHr < c.MinRestingHr
+                            THEN ISNULL(n.RestingHr, c.MinRestingHr) ELSE c.MinRestingHr END,
+        MaxRestingHr = CASE WHEN c.MaxRestingHr IS NULL OR n.RestingHr > c.MaxRestingHr
+                            THEN ISNULL(n.RestingHr, c.MaxRestingHr) ELSE c.MaxRestingHr END,
+        TotalRestingHr = c.TotalRestingHr + CASE WHEN n.RestingHr IS NULL THEN 0 ELSE 1 END
+    FROM WeightStatsCache AS c
+    CROSS JOIN (SELECT CAST(? AS DATE) AS Date, CAST(? AS FLOAT) AS Weight, CAST(? AS INT) AS RestingHr) AS n
+    WHERE c.Id = 1 AND c.Total > 0 AND n.Weight IS NOT NULL;
+'''
+
+# Rebuild WeightMonthlyCache (first and last weight of each month) from all entries with a weight
+REBUILD_MONTHLY_CACHE_SQL = '''
+    DELETE FROM WeightMonthlyCache;
+    INSERT INTO WeightMonthlyCache (Month, FirstWeight, LastWeight)
+    SELECT Month, MAX(FirstWeight), MAX(LastWeight)
+    FROM (
+        SELECT DATEFROMPARTS(YEAR(Date), MONTH(Date), 1) AS Month,
+               FIRST_VALUE(Weight) OVER (PARTITION BY YEAR(Date), MONTH(Date) ORDER BY Date) AS FirstWeight,
+               LAST_VALUE(Weight) OVER (PARTITION BY YEAR(Date), MONTH(Date) ORDER BY Date
+                                        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) AS LastWeight
+        FROM Weights
+        WHERE Weight IS NOT NULL
+    ) AS m
+    GROUP BY Month;
+'''
+
+# Refresh the WeightMonthlyCache row for the month containing a date, seeking only that month's entries
+REFRESH_MONTH_CACHE_SQL = '''
+    MERGE WeightMonthlyCache AS c
+    USING (
+        SELECT m.Month,
+               (SELECT TOP 1 Weight FROM Weights
+                WHERE Weight IS NOT NULL AND Date >= m.Month AND Date < DATEADD(MONTH, 1, m.Month)
+                ORDER BY Date) AS FirstWeight,
+               (SELECT TOP 1 Weight FROM Weights
+                WHERE Weight IS NOT NULL AND Date >= m.Month AND Date < DATEADD(MONTH, 1, m.Month)
+                ORDER BY Date DESC) AS LastWeight
+        FROM (SELECT DATEFROMPARTS(YEAR(d.Date), MONTH(d.Date), 1) AS Month
+              FROM (SELECT CAST(? AS DATE) AS Date) AS d) AS m
+    ) AS s
+    ON c.Month = s.Month
+    WHEN MATCHED AND s.FirstWeight IS NULL THEN
+        DELETE
+    WHEN MATCHED THEN
+        UPDATE SET FirstWeight = s.FirstWeight, LastWeight = s.LastWeight
+    WHEN NOT MATCHED AND s.FirstWeight IS NOT NULL THEN
+        INSERT (Month, FirstWeight, LastWeight) VALUES (s.Month, s.FirstWeight, s.LastWeight);
+'''
+
+# Rebuild both statistics caches after bulk changes to the entries
+REBUILD_STATS_CACHES_SQL = f'''
+    SET NOCOUNT ON;
+    {REFRESH_STATS_CACHE_SQL}
+    {REBUILD_MONTHLY_CACHE_SQL}
+'''
+
+# Rebuild the summary statistics and refresh the month of one changed entry
+REFRESH_ENTRY_STATS_SQL = f'''
+    SET NOCOUNT ON;
+    {REFRESH_STATS_CACHE_SQL}
+    {REFRESH_MONTH_CACHE_SQL}
+'''
+
+# Insert an entry and, if it was added, update the next entry's trend and the cached statistics
+# in the same round-trip (rebuilding the statistics if the cache is empty)
+ADD_ENTRY_WITH_STATS_SQL = f'''
+    SET NOCOUNT ON;
+    {ADD_ENTRY_SQL}
+    IF @@ROWCOUNT = 1
+    BEGIN
+        {NEXT_TREND_SQL}
+        IF EXISTS (SELECT * FROM WeightStatsCache WHERE Id = 1 AND Total > 0)
+        BEGIN
+            {ADD_TO_STATS_CACHE_SQL}
+        END
+        ELSE
+        BEGIN
+            {REFRESH_STATS_CACHE_SQL}
+        END
+        {REFRESH_MONTH_CACHE_SQL}
+    END
+'''
+
+# Weight change between the first and last weighted entry of each month, read from the monthly cache
+MONTHLY_CHANGE_SQL = '''
+    SELECT Month, LastWeight - FirstWeight AS WeightChange
+    FROM WeightMonthlyCache
+    ORDER BY Month;
+'''
+
+# Maximum number of points drawn per line before the series is downsampled
+MAX_PLOT_POINTS = 2000
+
+def downsample_min_max(x, y, n_out=MAX_PLOT_POINTS):
+    """
+    Reduce a series for plotting by keeping the minimum and maximum point of each bucket.
+
+    Series that already fit within n_out points are returned unchanged. Missing (NaN) values are
+    kept as one NaN point per bucket that contains any, so gaps in the line survive downsampling.
+
+    Args:
+        x (numpy.ndarray): X values (e.g. dates) of the series.
+        y (numpy.ndarray): Y values of the series, with NaN for missing values.
+        n_out (int): Maximum number of points to return.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: The downsampled x and y values.
+    """
+    if len(y) <= n_out:
+        return x, y
+
+    # Split the series into equal buckets, each contributing at most its min, its max and a gap marker
+    n_buckets = n_out // 3
+    edges = np.linspace(0, len(y), n_buckets + 1).astype(int)
+    buckets = np.repeat(np.arange(n_buckets), np.diff(edges))
+    missing = np.isnan(y)
+    # NaN never compares equal, so the min/max matches below only pick real values
+    mins = np.minimum.reduceat(np.where(missing, np.inf, y), edges[:-1])
+    maxs = np.maximum.reduceat(np.where(missing, -np.inf, y), edges[:-1])
+
+    def first_per_bucket(idx):
+        return idx[np.unique(buckets[idx], return_index=True)[1]]
+
+    keep = np.union1d(first_per_bucket(np.flatnonzero(y == mins[buckets])),
+                      first_per_bucket(np.flatnonzero(y == maxs[buckets])))
+    keep = np.union1d(keep, first_per_bucket(np.flatnonzero(missing)))
+    return x[keep], y[keep]
 
 class WeightTracker:
     def __init__(self):
@@ -14,7 +315,8 @@ class WeightTracker:
         Initialize the WeightTracker application.
 
         - Reads database connection parameters from environment variables.
-        - Establishes a connection to the SQL Server database.
+        - Establishes a write connection and a separate read connection to the SQL Server database
+          (plus a turbodbc one for reads, if available).
         - Calls create_table() to ensure the Weights table exists.
         """
         # Get database parameters from environment variables
@@ -22,13 +324,14 @@ class WeightTracker:
         wtdb_name = os.environ.get('WTDB_NAME')
         db_user = os.environ.get('DB_USER')
         db_password = os.environ.get('DB_PASSWORD')
+        # Optional path of the backup file as seen by the SQL Server instance (e.g. a UNC share)
+        self.backup_server_path = os.environ.get('BACKUP_SERVER_PATH')
 
         # Check that required variables are set
         if not all([wtdb_name, db_user, db_password]):
             raise ValueError("WTDB_NAME, DB_USER, and DB_PASSWORD environment variables must be set.")
 
-        # Initialize the SQL Server connection
-        self.conn = pyodbc.connect(
+        connection_string = (
             f'DRIVER={{ODBC Driver 17 for SQL Server}};'
             f'SERVER={db_host};'
             f'DATABASE={wtdb_name};'
@@ -36,12 +339,41 @@ class WeightTracker:
             f'PWD={db_password};'
             'Trusted_Connection=no;'
         )
+
+        # Initialize the SQL Server connection
+        self.conn = pyodbc.connect(connection_string)
+        # Changes are grouped into explicit transactions and committed with self.conn.commit()
+        self.conn.autocommit = False
         self.cursor = self.conn.cursor()
+        # Send executemany() parameters as batched arrays instead of one round-trip per row
+        self.cursor.fast_executemany = True
+        # Separate autocommit connection for long reads, so scans don't hold locks in the write transaction
+        self.read_conn = pyodbc.connect(connection_string, autocommit=True)
+        self.read_cursor = self.read_conn.cursor()
+        self._enable_snapshot_reads()
+        # Columnar connection for large reads, if turbodbc is installed
+        self.arrow_conn = None
+        if turbodbc is not None:
+            self.arrow_conn = turbodbc.connect(connection_string=connection_string,
+                                               turbodbc_options=turbodbc.make_options(use_async_io=True,
+                                                                                      autocommit=True))
         self.create_table()
 
+    def _enable_snapshot_reads(self):
+        """
+        Read from row versions on the read connection if the database allows snapshot isolation.
+
+        Snapshot reads take no shared locks, so long scans don't block or get blocked by writes.
+        Otherwise the read connection keeps the default READ COMMITTED level.
+        """
+        self.read_cursor.execute("SELECT snapshot_isolation_state FROM sys.databases WHERE name = DB_NAME()")
+        result = self.read_cursor.fetchone()
+        if result is not None and result.snapshot_isolation_state == 1:
+            self.read_cursor.execute("SET TRANSACTION ISOLATION LEVEL SNAPSHOT")
+
     def create_table(self):
         """
-        Create the Weights table in the database if it doesn't exist.
+        Create the Weights table, its indexes and the statistics cache in the database if they don't exist.
         """
         self.cursor.execute('''
         IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='Weights' AND xtype='U')
@@ -56,6 +388,54 @@ class WeightTracker:
             );
         END
         ''')
+        # Index the dated weights so the previous-weight lookups and weight-only scans seek instead of scan
+        self.cursor.execute('''
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name='IX_Weights_Date_Weight' AND object_id=OBJECT_ID('Weights'))
+        BEGIN
+            CREATE INDEX IX_Weights_Date_Weight ON Weights (Date DESC) INCLUDE (Weight) WHERE Weight IS NOT NULL;
+        END
+        ''')
+        # Single-row cache of the summary statistics shown by calculate_statistics()
+        self.cursor.execute('''
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='WeightStatsCache' AND xtype='U')
+        BEGIN
+            CREATE TABLE WeightStatsCache (
+                Id INT NOT NULL PRIMARY KEY CHECK (Id = 1),
+                AvgWeight FLOAT NULL,
+                MinWeight FLOAT NULL,
+                MaxWeight FLOAT NULL,
+                Total INT NOT NULL,
+                FirstDate DATE NULL,
+                LastDate DATE NULL,
+                FirstWeight FLOAT NULL,
+                LastWeight FLOAT NULL,
+                AvgRestingHr FLOAT NULL,
+                MinRestingHr INT NULL,
+                MaxRestingHr INT NULL,
+                TotalRestingHr INT NOT NULL
+            );
+        END
+        ''')
+        # First and last weight of each month, for the monthly changes shown by calculate_statistics()
+        self.cursor.execute('''
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='WeightMonthlyCache' AND xtype='U')
+        BEGIN
+            CREATE TABLE WeightMonthlyCache (
+                Month DATE NOT NULL PRIMARY KEY,
+                FirstWeight FLOAT NOT NULL,
+                LastWeight FLOAT NOT NULL
+            );
+        END
+        ''')
+        # Every write keeps the caches current, so only build them when they are missing
+        self._execute_batch(f'''
+        IF NOT EXISTS (SELECT * FROM WeightStatsCache WHERE Id = 1)
+           OR (NOT EXISTS (SELECT * FROM WeightMonthlyCache)
+               AND EXISTS (SELECT * FROM WeightStatsCache WHERE Id = 1 AND Total > 0))
+        BEGIN
+            {REBUILD_STATS_CACHES_SQL}
+        END
+        ''')
         self.conn.commit()
 
     def validate_date(self, date_str):
@@ -69,6 +449,9 @@ class WeightTracker:
             datetime.date or None: Validated date or None if invalid.
         """
         try:
+            parsed = _parse_iso_date(date_str)
+            if parsed is not None:
+                return parsed
             return datetime.strptime(date_str, "%Y-%m-%d").date()
         except ValueError:
             print("Invalid date format. Please enter in YYYY-MM-DD.")
@@ -85,6 +468,8 @@ class WeightTracker:
         Returns:
             float or None: Validated float or None if invalid.
         """
+        if _FLOAT_RE.fullmatch(value_str):
+            return float(value_str)
         try:
             value = float(value_str)
             if value < 0:
@@ -106,6 +491,8 @@ class WeightTracker:
         Returns:
             int or None: Validated integer or None if invalid.
         """
+        if _INT_RE.fullmatch(value_str):
+            return int(value_str)
         try:
             value = int(value_str)
             if value < 0:
@@ -156,18 +543,15 @@ class WeightTracker:
             if resting_hr is not None:
                 break
 
-        # Determine weight trend based on previous entry
-        weight_trend = self.calculate_weight_trend(weight)
-
-        # Insert data into SQL Server
+        # Insert data into SQL Server, determining the weight trend from the previous entry, refreshing
+        # the trend of the following entry and folding the new weight into the cached statistics in one batch
         try:
-            self.cursor.execute('''
-            INSERT INTO Weights (Date, Weight, Notes, WeightTrend, SleepDrtn, RestingHr)
-            VALUES (?, ?, ?, ?, ?, ?);
-            ''', (date, weight, notes, weight_trend, sleep_duration, resting_hr))
+            self._execute_batch(ADD_ENTRY_WITH_STATS_SQL,
+                                (date, weight, notes, sleep_duration, resting_hr, date, date, weight, resting_hr, date))
             self.conn.commit()
             print("Weight entry added successfully!")
         except Exception as e:
+            self.conn.rollback()
             print(f"Error adding entry: {e}")
 
     def update_weight_entry(self):
@@ -182,7 +566,7 @@ class WeightTracker:
                 break
 
         # Check if the entry exists
-        self.cursor.execute("SELECT * FROM Weights WHERE Date = ?", (date,))
+        self.cursor.execute(f"SELECT {ENTRY_COLUMNS} FROM Weights WHERE Date = ?", (date,))
         result = self.cursor.fetchone()
 
         if not result:
@@ -225,211 +609,201 @@ class WeightTracker:
             if resting_hr is not None:
                 break
 
-        # Determine weight trend based on the updated weight
-        weight_trend = self.calculate_weight_trend(weight)
-
-        # Update the entry in SQL Server
+        # Update the entry in SQL Server, determining the weight trend from the updated weight and
+        # refreshing the trend of the following entry
         try:
-            self.cursor.execute('''
-            UPDATE Weights
-            SET Weight = ?, Notes = ?, WeightTrend = ?, SleepDrtn = ?, RestingHr = ?
-            WHERE Date = ?;
-            ''', (weight, notes, weight_trend, sleep_duration, resting_hr, date))
+            self._execute_batch(UPDATE_ENTRY_SQL, (weight, notes, sleep_duration, resting_hr, date, date))
+            # An updated weight can change any of the summary statistics, so rebuild them along with its month
+            self._execute_batch(REFRESH_ENTRY_STATS_SQL, (date,))
             self.conn.commit()
             print(f"Entry for {date} updated successfully!")
         except Exception as e:
+            self.conn.rollback()
             print(f"Error updating entry: {e}")
 
-    def calculate_weight_trend(self, current_weight):
+    def _execute_batch(self, sql, params=()):
         """
-        Calculate the weight trend based on the current and previous weight.
+        Execute a multi-statement batch on the write cursor and consume all of its results.
 
-        Args:
-            current_weight (float): The current weight entered by the user.
+        pyodbc only raises errors from later statements in a batch while moving through
+        its results, so the batch is drained before the caller commits.
 
-        Returns:
-            str: The weight trend ('increasing', 'decreasing', 'stable', etc.).
+        Args:
+            sql (str): The batch to execute.
+            params (tuple): Parameters for the batch's placeholders, in order.
         """
-        # If no weight was provided, we can't determine a trend
-        if current_weight is None:
-            return "No weight provided"
-
-        # Fetch the most recent previous weight entry from the database
-        self.cursor.execute("SELECT TOP 1 Weight FROM Weights WHERE Weight IS NOT NULL ORDER BY Date DESC")
-        result = self.cursor.fetchone()
-
-        if result is None or result.Weight is None:
-            # No previous weight entries, so no trend can be determined
-            return "No trend"
-
-        previous_weight = result.Weight
-
-        # Determine trend based on comparison with previous weight
-        if current_weight > previous_weight:
-            return "increasing"
-        elif current_weight < previous_weight:
-            return "decreasing"
-        else:
-            return "stable"
+        self.cursor.execute(sql, params)
+        while self.cursor.nextset():
+            pass
 
     def visualize_weight_data(self):
         """
         Visualize weight, sleep duration, and resting heart rate data over time.
         """
         # Fetch all relevant data for visualization
-        self.cursor.execute("SELECT Date, Weight, SleepDrtn, RestingHr FROM Weights ORDER BY Date")
-        data = self.cursor.fetchall()
+        df = self._read_dataframe("SELECT Date, Weight, SleepDrtn, RestingHr FROM Weights ORDER BY Date",
+                                  parse_dates=['Date'])
 
-        if not data:
+        if df.empty:
             print("No data to visualize.")
             return
 
-        dates = [row.Date for row in data]
-        weights = [row.Weight for row in data]
-        sleep_durations = [row.SleepDrtn for row in data]
-        resting_hrs = [row.RestingHr for row in data]
+        # Convert the columns to float arrays with NULLs as NaN for plotting
+        dates = df['Date'].values
+        weights = df['Weight'].to_numpy(dtype=np.float64, na_value=np.nan)
+        sleep_durations = df['SleepDrtn'].to_numpy(dtype=np.float64, na_value=np.nan)
+        resting_hrs = df['RestingHr'].astype('Float64').to_numpy(dtype=np.float64, na_value=np.nan)
 
-        # Convert None values to NaN for plotting
-        weights = [np.nan if w is None else w for w in weights]
-        sleep_durations = [np.nan if s is None else s for s in sleep_durations]
-        resting_hrs = [np.nan if r is None else r for r in resting_hrs]
+        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, sharex=True, figsize=(10, 8))
 
         # Plot weight data
-        plt.figure(figsize=(10, 8))
-
-        plt.subplot(3, 1, 1)
-        plt.plot(dates, weights, marker='o', label="Weight (lbs)")
-        plt.ylabel("Weight (lbs)")
-        plt.title("Weight Tracking Over Time")
-        plt.grid(True)
+        ax1.plot(*downsample_min_max(dates, weights), '-o', markersize=3, label="Weight (lbs)")
+        ax1.set_ylabel("Weight (lbs)")
+        ax1.set_title("Weight Tracking Over Time")
+        ax1.grid(True)
 
         # Plot sleep duration
-        plt.subplot(3, 1, 2)
-        plt.plot(dates, sleep_durations, marker='o', color="orange", label="Sleep Duration (hrs)")
-        plt.ylabel("Sleep Duration (hrs)")
-        plt.title("Sleep Duration Over Time")
-        plt.grid(True)
+        ax2.plot(*downsample_min_max(dates, sleep_durations), '-o', markersize=3, color="orange",
+                 label="Sleep Duration (hrs)")
+        ax2.set_ylabel("Sleep Duration (hrs)")
+        ax2.set_title("Sleep Duration Over Time")
+        ax2.grid(True)
 
         # Plot resting heart rate
-        plt.subplot(3, 1, 3)
-        plt.plot(dates, resting_hrs, marker='o', color="green", label="Resting HR (bpm)")
-        plt.ylabel("Resting HR (bpm)")
-        plt.title("Resting Heart Rate Over Time")
-        plt.grid(True)
+        ax3.plot(*downsample_min_max(dates, resting_hrs), '-o', markersize=3, color="green",
+                 label="Resting HR (bpm)")
+        ax3.set_ylabel("Resting HR (bpm)")
+        ax3.set_title("Resting Heart Rate Over Time")
+        ax3.grid(True)
 
-        plt.tight_layout()
+        fig.tight_layout()
         plt.show()
 
         # Plot Sleep vs Resting HR
-        plt.figure(figsize=(8, 6))
-        plt.scatter(sleep_durations, resting_hrs, color="purple")
-        plt.xlabel("Sleep Duration (hrs)")
-        plt.ylabel("Resting HR (bpm)")
-        plt.title("Sleep Duration vs Resting Heart Rate")
-        plt.grid(True)
+        fig, ax = plt.subplots(figsize=(8, 6))
+        ax.scatter(sleep_durations, resting_hrs, color="purple")
+        ax.set_xlabel("Sleep Duration (hrs)")
+        ax.set_ylabel("Resting HR (bpm)")
+        ax.set_title("Sleep Duration vs Resting Heart Rate")
+        ax.grid(True)
         plt.show()
 
     def view_weight_log(self):
         """
         Display all weight entries in the database.
         """
-        # Fetch and display all weight entries
-        self.cursor.execute("SELECT * FROM Weights ORDER BY Date")
-        result = self.cursor.fetchall()
+        # Fetch and display all weight entries a batch at a time. On a terminal the log is
+        # buffered and written once, or shown in a pager if it is longer than the screen.
+        self.read_cursor.execute(f"SELECT {ENTRY_COLUMNS} FROM Weights ORDER BY Date")
 
-        if not result:
+        interactive = sys.stdout.isatty()
+        out = io.StringIO() if interactive else sys.stdout
+        found = False
+        while True:
+            entries = self.read_cursor.fetchmany(LOG_FETCH_SIZE)
+            if not entries:
+                break
+            found = True
+            out.write(''.join(self._format_log_entry(entry) for entry in entries))
+
+        if not found:
             print("No weight entries found.")
-        else:
-            for entry in result:
-                weight_display = f"{entry.Weight} lbs" if entry.Weight is not None else "No weight"
-                print(f"Date: {entry.Date}, Weight: {weight_display}, Notes: {entry.Notes}, Trend: {entry.WeightTrend}, "
-                      f"Sleep Duration: {entry.SleepDrtn} hours, Resting HR: {entry.RestingHr} bpm")
+        elif interactive:
+            text = out.getvalue()
+            if text.count('\n') >= shutil.get_terminal_size().lines:
+                pydoc.pager(text)
+            else:
+                sys.stdout.write(text)
+
+    def _format_log_entry(self, entry):
+        """
+        Format a weight entry as a line of the weight log.
+
+        Args:
+            entry (pyodbc.Row): Row with the ENTRY_COLUMNS of the Weights table.
+
+        Returns:
+            str: The formatted line, ending with a newline.
+        """
+        weight_display = f"{entry.Weight} lbs" if entry.Weight is not None else "No weight"
+        return (f"Date: {entry.Date}, Weight: {weight_display}, Notes: {entry.Notes}, Trend: {entry.WeightTrend}, "
+                f"Sleep Duration: {entry.SleepDrtn} hours, Resting HR: {entry.RestingHr} bpm\n")
 
     def calculate_statistics(self):
         """
         Calculate and display statistical data from weight entries.
+
+        Both the summary and the monthly changes are read from caches kept current by every write.
         """
-        # Fetch weight data to calculate statistics
-        self.cursor.execute("SELECT Date, Weight, RestingHr FROM Weights WHERE Weight IS NOT NULL ORDER BY Date")
-        data = self.cursor.fetchall()
-        if not data:
+        # Read the cached statistics
+        self.read_cursor.execute("SELECT * FROM WeightStatsCache WHERE Id = 1")
+        stats = self.read_cursor.fetchone()
+        if stats is None or stats.Total == 0:
             print("No weight data available for statistics.")
             return
 
-        dates = [entry.Date for entry in data]
-        weights = [entry.Weight for entry in data]
-        resting_hrs = [entry.RestingHr for entry in data if entry.RestingHr is not None]
+        total_days = (stats.LastDate - stats.FirstDate).days or 1  # Avoid division by zero
 
-        avg_weight = statistics.mean(weights)
-        min_weight = min(weights)
-        max_weight = max(weights)
-        total_entries = len(weights)
-        total_days = (dates[-1] - dates[0]).days or 1  # Avoid division by zero
-
-        total_weight_change = weights[-1] - weights[0]
+        total_weight_change = stats.LastWeight - stats.FirstWeight
         average_daily_change = total_weight_change / total_days
 
-        print(f"Average Weight: {avg_weight:.2f} lbs")
-        print(f"Minimum Weight: {min_weight:.2f} lbs")
-        print(f"Maximum Weight: {max_weight:.2f} lbs")
-        print(f"Total Entries with Weight: {total_entries}")
+        print(f"Average Weight: {stats.AvgWeight:.2f} lbs")
+        print(f"Minimum Weight: {stats.MinWeight:.2f} lbs")
+        print(f"Maximum Weight: {stats.MaxWeight:.2f} lbs")
+        print(f"Total Entries with Weight: {stats.Total}")
         print(f"Total Weight Change: {total_weight_change:.2f} lbs")
         print(f"Average Daily Weight Change: {average_daily_change:.4f} lbs/day")
 
         # Resting heart rate analysis
-        if resting_hrs:
-            avg_resting_hr = statistics.mean(resting_hrs)
-            min_resting_hr = min(resting_hrs)
-            max_resting_hr = max(resting_hrs)
-            print(f"Average Resting Heart Rate: {avg_resting_hr:.2f} bpm")
-            print(f"Minimum Resting Heart Rate: {min_resting_hr} bpm")
-            print(f"Maximum Resting Heart Rate: {max_resting_hr} bpm")
+        if stats.TotalRestingHr:
+            print(f"Average Resting Heart Rate: {stats.AvgRestingHr:.2f} bpm")
+            print(f"Minimum Resting Heart Rate: {stats.MinRestingHr} bpm")
+            print(f"Maximum Resting Heart Rate: {stats.MaxRestingHr} bpm")
         else:
             print("No resting heart rate data available.")
 
-        # Calculate weight loss/gain by month
-        monthly_weights = defaultdict(list)
-        for date, weight in zip(dates, weights):
-            year_month = (date.year, date.month)
-            monthly_weights[year_month].append((date, weight))
+        # Read the cached weight loss/gain by month, one row per month
+        self.read_cursor.execute(MONTHLY_CHANGE_SQL)
+        monthly = self.read_cursor.fetchall()
 
         print("\nWeight Change by Month:")
-        for year_month in sorted(monthly_weights.keys()):
-            entries = monthly_weights[year_month]
-            entries.sort(key=lambda x: x[0])  # Ensure entries are sorted by date
-            start_weight = entries[0][1]
-            end_weight = entries[-1][1]
-            weight_change = end_weight - start_weight
-            month_name = datetime(year_month[0], year_month[1], 1).strftime('%B %Y')
-            print(f"{month_name}: {weight_change:.2f} lbs")
+        for month in monthly:
+            month_name = month.Month.strftime('%B %Y')
+            print(f"{month_name}: {month.WeightChange:.2f} lbs")
 
     def predict_weight(self):
         """
         Predict future weight for the next 30 days using linear regression.
         """
         # Machine Learning Predictions
-        self.cursor.execute("SELECT Date, Weight FROM Weights WHERE Weight IS NOT NULL ORDER BY Date")
-        data = self.cursor.fetchall()
+        df = self._read_dataframe("SELECT Date, Weight FROM Weights WHERE Weight IS NOT NULL ORDER BY Date",
+                                  parse_dates=['Date'])
 
-        if len(data) < 2:
+        if len(df) < 2:
             print("Not enough data for predictions.")
             return
 
-        dates = np.array([(entry.Date - data[0].Date).days for entry in data]).reshape(-1, 1)
-        weights = np.array([entry.Weight for entry in data])
+        first_date = df['Date'].values[0].astype('datetime64[D]')
+        dates = (df['Date'].values.astype('datetime64[D]') - first_date).astype(np.int64)
+        weights = df['Weight'].to_numpy(dtype=np.float64)
 
-        model = LinearRegression()
-        model.fit(dates, weights)
+        # Closed-form least-squares fit of weight against days since the first entry
+        x = dates.astype(np.float64)
+        x_mean = x.mean()
+        y_mean = weights.mean()
+        x_centered = x - x_mean
+        slope = np.dot(x_centered, weights - y_mean) / np.dot(x_centered, x_centered)
+        intercept = y_mean - slope * x_mean
 
         # Predict next 30 days
-        future_dates = np.array([dates[-1][0] + i for i in range(1, 31)]).reshape(-1, 1)
-        predictions = model.predict(future_dates)
+        future_dates = np.arange(1, 31) + dates[-1]
+        predictions = intercept + slope * future_dates
 
-        future_dates_plot = [data[0].Date + timedelta(days=int(day[0])) for day in future_dates]
+        future_dates_plot = first_date + future_dates.astype('timedelta64[D]')
 
         # Plotting
         plt.figure(figsize=(10, 6))
-        plt.plot([entry.Date for entry in data], weights, label='Actual Weight')
+        plt.plot(*downsample_min_max(df['Date'].values, weights), label='Actual Weight')
         plt.plot(future_dates_plot, predictions, label='Predicted Weight', linestyle='--')
         plt.title('Weight Prediction for Next 30 Days')
         plt.xlabel('Date')
@@ -438,18 +812,202 @@ class WeightTracker:
         plt.grid(True)
         plt.show()
 
+    def _read_dataframe(self, sql, parse_dates=None):
+        """
+        Read the results of a query into a DataFrame.
+
+        Uses turbodbc's Arrow fetch when available, otherwise the read cursor in chunks.
+
+        Args:
+            sql (str): The SELECT statement to run.
+            parse_dates (list[str], optional): Columns to convert to datetime64.
+
+        Returns:
+            pandas.DataFrame: The query results (empty if there are no rows).
+        """
+        if self.arrow_conn is not None:
+            cursor = self.arrow_conn.cursor()
+            try:
+                cursor.execute(sql)
+                df = cursor.fetchallarrow().to_pandas(split_blocks=True, self_destruct=True)
+            finally:
+                cursor.close()
+        else:
+            columns, chunks = self._fetch_chunks(sql, READ_CHUNKSIZE)
+            chunks = list(chunks)
+            # A chunk whose column is all NULL comes back as object dtype, so re-infer after joining
+            df = pd.concat(chunks, ignore_index=True).infer_objects() if chunks else pd.DataFrame(columns=columns)
+        for column in parse_dates or []:
+            df[column] = pd.to_datetime(df[column])
+        return df
+
+    def _fetch_chunks(self, sql, chunksize):
+        """
+        Run a query on the read cursor and fetch its results as DataFrame chunks.
+
+        Args:
+            sql (str): The SELECT statement to run.
+            chunksize (int): Number of rows per chunk.
+
+        Returns:
+            tuple[list[str], Iterator[pandas.DataFrame]]: The column names and a lazy iterator over the chunks.
+        """
+        self.read_cursor.execute(sql)
+        columns = [column[0] for column in self.read_cursor.description]
+
+        def chunks():
+            while True:
+                rows = self.read_cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records([tuple(row) for row in rows], columns=columns, coerce_float=True)
+
+        return columns, chunks()
+
+    def _read_csv_rows(self, filename):
+        """
+        Read a CSV file with the Weights table columns into parameter tuples for the Weights INSERT.
+
+        Blank lines are skipped. Lines whose values can't be converted are collected as errors
+        instead of stopping the read.
+
+        Args:
+            filename (str): Path of the CSV file to read.
+
+        Returns:
+            tuple[list[tuple], list[str]]: One tuple per valid row, with empty values replaced by None,
+            and a message for each line that could not be read.
+
+        Raises:
+            ValueError: If the header is missing one of the Weights table columns.
+        """
+        columns = ('Date', 'Weight', 'Notes', 'WeightTrend', 'SleepDrtn', 'RestingHr')
+        rows = []
+        errors = []
+        with open(filename, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            missing = [column for column in columns if column not in header]
+            if missing:
+                raise ValueError(f"{filename} is missing the column(s): {', '.join(missing)}")
+            # Locate the columns by name so the file's column order doesn't matter
+            date_i, weight_i, notes_i, trend_i, sleep_i, hr_i = (header.index(column) for column in columns)
+            for row in reader:
+                if not any(value.strip() for value in row):
+                    continue
+                # Bind values with the types declared in INSERT_INPUT_SIZES
+                try:
+                    rows.append((self._parse_csv_date(row[date_i]),
+                                 float(row[weight_i]) if row[weight_i] else None,
+                                 row[notes_i] or None,
+                                 row[trend_i] or None,
+                                 float(row[sleep_i]) if row[sleep_i] else None,
+                                 int(float(row[hr_i])) if row[hr_i] else None))
+                except (ValueError, IndexError) as e:
+                    errors.append(f"line {reader.line_num}: {e}")
+        return rows, errors
+
+    def _parse_csv_date(self, date_str):
+        """
+        Parse a date from a CSV file, accepting formats other than YYYY-MM-DD.
+
+        Args:
+            date_str (str): Date string from the file.
+
+        Returns:
+            datetime.date: The parsed date.
+
+        Raises:
+            ValueError: If the string is not a recognizable date.
+        """
+        parsed = _parse_iso_date(date_str)
+        if parsed is not None:
+            return parsed
+        # pandas returns NaT rather than raising for blank input, and NaT would bind as 0001-01-01
+        if not date_str.strip():
+            raise ValueError("missing date")
+        parsed = pd.to_datetime(date_str)
+        if pd.isna(parsed):
+            raise ValueError(f"invalid date: {date_str!r}")
+        return parsed.date()
+
+    def _insert_rows(self, rows):
+        """
+        Insert rows into the Weights table with a single prepared batch.
+
+        The caller is responsible for committing the transaction.
+
+        Args:
+            rows (list[tuple]): Parameter tuples as returned by _read_csv_rows().
+        """
+        # executemany() rejects an empty parameter list, e.g. from a backup of an empty table
+        if not rows:
+            return
+        # Declare the parameter types up front so the statement is prepared once for the whole batch
+        self.cursor.setinputsizes(INSERT_INPUT_SIZES)
+        try:
+            self.cursor.executemany(INSERT_SQL, rows)
+        finally:
+            self.cursor.setinputsizes(None)
+
+    def _write_csv(self, sql, filename, dtype=None):
+        """
+        Stream the results of a query to a CSV file in chunks.
+
+        Args:
+            sql (str): The SELECT statement to run.
+            filename (str): Path of the CSV file to write.
+            dtype (dict, optional): Column dtypes to apply to each chunk before writing.
+        """
+        if self.arrow_conn is not None:
+            cursor = self.arrow_conn.cursor()
+            try:
+                cursor.execute(sql)
+                columns = [column[0] for column in cursor.description]
+                chunks = (batch.to_pandas() for batch in cursor.fetcharrowbatches())
+                self._write_csv_chunks(chunks, columns, filename, dtype)
+            finally:
+                cursor.close()
+            return
+
+        columns, chunks = self._fetch_chunks(sql, EXPORT_CHUNKSIZE)
+        self._write_csv_chunks(chunks, columns, filename, dtype)
+
+    def _write_csv_chunks(self, chunks, columns, filename, dtype=None):
+        """
+        Write DataFrame chunks to a single CSV file with LF line endings.
+
+        Args:
+            chunks (Iterable[pandas.DataFrame]): The chunks to write, in order.
+            columns (list[str]): Header to write if there are no chunks.
+            filename (str): Path of the CSV file to write.
+            dtype (dict, optional): Column dtypes to apply to each chunk before writing.
+        """
+        first = True
+        for chunk in chunks:
+            if dtype:
+                chunk = chunk.astype(dtype)
+            chunk.to_csv(filename, index=False, mode='w' if first else 'a', header=first, lineterminator='\n')
+            first = False
+        if first:
+            pd.DataFrame(columns=columns).to_csv(filename, index=False, lineterminator='\n')
+
     def backup_data(self):
         """
         Backup data to a CSV file named 'weight_data_backup.csv'.
         """
         # Backup data to a CSV file
-        self.cursor.execute("SELECT * FROM Weights")
-        data = self.cursor.fetchall()
-        columns = [column[0] for column in self.cursor.description]
-        df = pd.DataFrame(data, columns=columns)
         backup_filename = 'weight_data_backup.csv'
-        df.to_csv(backup_filename, index=False)
+        # Keep resting heart rates as whole numbers so the file can be bulk loaded back into the INT column
+        self._write_csv(f"SELECT {ENTRY_COLUMNS} FROM Weights", backup_filename, dtype={'RestingHr': 'Int64'})
         print(f"Data backed up to {backup_filename}")
+        # Keep the copy the server restores from in step with the local backup
+        if self.backup_server_path:
+            try:
+                shutil.copyfile(backup_filename, self.backup_server_path)
+                print(f"Data backed up to {self.backup_server_path}")
+            except OSError as e:
+                print(f"Could not copy the backup to {self.backup_server_path}: {e}")
 
     def restore_data(self):
         """
@@ -460,17 +1018,39 @@ class WeightTracker:
         if not os.path.exists(backup_filename):
             print(f"No backup file found: {backup_filename}")
             return
-        df = pd.read_csv(backup_filename)
-        # Clear existing data
-        self.cursor.execute("DELETE FROM Weights")
-        self.conn.commit()
-        # Insert backup data
-        for index, row in df.iterrows():
-            self.cursor.execute('''
-                INSERT INTO Weights (Date, Weight, Notes, WeightTrend, SleepDrtn, RestingHr)
-                VALUES (?, ?, ?, ?, ?, ?);
-            ''', (row['Date'], row['Weight'], row['Notes'], row['WeightTrend'], row['SleepDrtn'], row['RestingHr']))
-        self.conn.commit()
+        # Load the file on the server when it can see it, replacing the data in a single transaction.
+        # Only do so when the server copy exists, so a missing or stale path can't stand in for the local backup.
+        if self.backup_server_path and os.path.exists(self.backup_server_path):
+            try:
+                self.cursor.execute("TRUNCATE TABLE Weights")
+                self.cursor.execute(BULK_INSERT_SQL.format(path=self.backup_server_path.replace("'", "''")))
+                self._execute_batch(REBUILD_STATS_CACHES_SQL)
+                self.conn.commit()
+                print("Data restored successfully!")
+                return
+            except Exception as e:
+                self.conn.rollback()
+                print(f"Server-side restore failed ({e}), restoring from {backup_filename} instead.")
+
+        try:
+            rows, errors = self._read_csv_rows(backup_filename)
+        except ValueError as e:
+            print(f"Error restoring data: {e}")
+            return
+        if errors:
+            # Restore replaces all data, so don't restore a partial backup
+            print(f"Error restoring data: could not read {backup_filename} ({'; '.join(errors)})")
+            return
+        # Clear existing data and insert backup data in a single transaction
+        try:
+            self.cursor.execute("DELETE FROM Weights")
+            self._insert_rows(rows)
+            self._execute_batch(REBUILD_STATS_CACHES_SQL)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error restoring data: {e}")
+            return
         print("Data restored successfully!")
 
     def export_data(self):
@@ -478,12 +1058,8 @@ class WeightTracker:
         Export data to a CSV file named 'weight_data_export.csv'.
         """
         # Export data to a CSV file
-        self.cursor.execute("SELECT * FROM Weights")
-        data = self.cursor.fetchall()
-        columns = [column[0] for column in self.cursor.description]
-        df = pd.DataFrame(data, columns=columns)
         export_filename = 'weight_data_export.csv'
-        df.to_csv(export_filename, index=False)
+        self._write_csv(f"SELECT {ENTRY_COLUMNS} FROM Weights", export_filename, dtype={'RestingHr': 'Int64'})
         print(f"Data exported to {export_filename}")
 
     def import_data(self):
@@ -495,27 +1071,52 @@ class WeightTracker:
         if not os.path.exists(import_filename):
             print(f"No import file found: {import_filename}")
             return
-        df = pd.read_csv(import_filename)
-        # Insert imported data
-        for index, row in df.iterrows():
-            try:
-                self.cursor.execute('''
-                    INSERT INTO Weights (Date, Weight, Notes, WeightTrend, SleepDrtn, RestingHr)
-                    VALUES (?, ?, ?, ?, ?, ?);
-                ''', (row['Date'], row['Weight'], row['Notes'], row['WeightTrend'], row['SleepDrtn'], row['RestingHr']))
-            except Exception as e:
-                # Skip duplicates or errors
-                continue
-        self.conn.commit()
+        try:
+            rows, errors = self._read_csv_rows(import_filename)
+        except ValueError as e:
+            print(f"Error importing data: {e}")
+            return
+        if errors:
+            # Skip rows that can't be read, like rows the database rejects
+            print(f"Skipped {len(errors)} unreadable row(s) in {import_filename}: {'; '.join(errors)}")
+        if not rows:
+            print("No rows to import.")
+            return
+        # Insert imported data in one batch
+        try:
+            self._insert_rows(rows)
+        except Exception:
+            # The batch failed (e.g. a duplicate date), so insert row by row and skip the failures
+            self.conn.rollback()
+            for row in rows:
+                try:
+                    self.cursor.execute(INSERT_SQL, row)
+                except Exception as e:
+                    # Skip duplicates or errors
+                    continue
+        # Imported entries may be back-dated, so refresh the trends from the earliest one onwards
+        # and the cached statistics in the same transaction as the inserts
+        try:
+            self.cursor.execute(RECALCULATE_TRENDS_SQL, (min(row[0] for row in rows),))
+            self._execute_batch(REBUILD_STATS_CACHES_SQL)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error importing data: {e}")
+            return
         print("Data imported successfully!")
 
     def exit(self):
         """
-        Close the database connection and exit the application.
+        Close the database connections and exit the application.
         """
-        # Close the pyodbc cursor and connection
+        # Close the pyodbc cursors and connections
         self.cursor.close()
         self.conn.close()
+        self.read_cursor.close()
+        self.read_conn.close()
+        if self.arrow_conn is not None:
+            self.arrow_conn.close()
         print("Exiting the app.")
 
     def display_menu(self):